@@ -4,10 +4,19 @@ Neural Network for Image Classification
 Uses TensorFlow/Keras for deep learning
 """
 
-import tensorflow as tf
-from tensorflow import keras
 import numpy as np
-import matplotlib.pyplot as plt
+
+# TensorFlow is heavy to import; load Keras only when a model is built
+_keras = None
+
+
+def _get_keras():
+    global _keras
+    if _keras is None:
+        from tensorflow import keras
+        _keras = keras
+    return _keras
+
 
 class ImageClassifier:
     def __init__(self, input_shape=(224, 224, 3), num_classes=10):
@@ -16,6 +25,7 @@ class ImageClassifier:
         self.model = self._build_model()
     
     def _build_model(self):
+        keras = _get_keras()
         model = keras.Sequential([
             keras.layers.Conv2D(32, (3, 3), activation='relu', input_shape=self.input_shape),
             keras.layers.MaxPooling2D((2, 2)),
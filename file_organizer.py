@@ -13,38 +13,536 @@ Features:
 """
 
 import os
+import re
+import errno
+import asyncio
 import shutil
 import json
+import hashlib
+import sqlite3
+import threading
+import itertools
+import functools
+from array import array
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Dict, Iterable, Iterator, List, Set, Tuple, Optional
 import sys
+from concurrent.futures import ThreadPoolExecutor, as_completed, wait, FIRST_COMPLETED
 
 import click
 import ollama
 from rich.console import Console
-from rich.progress import Progress, SpinnerColumn, TextColumn
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, SpinnerColumn, TextColumn
 from rich.table import Table
 from rich.prompt import Confirm
 
 try:
     import magic
+    # One libmagic cookie, and one load of the magic database, for the whole run
+    _MIME_DETECTOR = magic.Magic(mime=True)
     HAS_MAGIC = True
 except ImportError:
     HAS_MAGIC = False
     print("Warning: python-magic not available. File type detection will be limited.")
+except Exception as e:
+    # e.g. a missing magic database, or the unrelated file-magic bindings
+    HAS_MAGIC = False
+    print(f"Warning: libmagic could not be initialized ({e}). File type detection will be limited.")
 
 console = Console()
 
+# Instructions are sent once as a system message, identical across requests so
+# Ollama can reuse its prompt cache; the user message carries only the file itself
+ANALYSIS_SYSTEM_PROMPT = (
+    "Categorize files for folder organization by their ACTUAL CONTENT, not name or extension. "
+    "Reply in JSON: category (e.g. Work Documents, Personal Files, Code Projects, Media), "
+    "subcategory (e.g. Financial Reports, Python Scripts, Family Photos), "
+    "confidence 0-100 and a brief reason."
+)
+BATCH_ANALYSIS_SYSTEM_PROMPT = (
+    ANALYSIS_SYSTEM_PROMPT
+    + ' The user sends a JSON list of files; reply {"results": [...]} with one entry per file, keeping its id.'
+)
+ANALYSIS_NUM_PREDICT = 80
+
+# Structured output schema - Ollama constrains generation to exactly one object
+ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "category": {"type": "string"},
+        "subcategory": {"type": "string"},
+        "confidence": {"type": "integer"},
+        "reason": {"type": "string"}
+    },
+    "required": ["category", "confidence"]
+}
+
+# Batched requests wrap the per-file objects so each can be matched back by id
+BATCH_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": dict(id={"type": "integer"}, **ANALYSIS_SCHEMA["properties"]),
+                "required": ["id"] + ANALYSIS_SCHEMA["required"]
+            }
+        }
+    },
+    "required": ["results"]
+}
+
+# Disk-bound work (directory scans, content reads) gets its own, wider pool;
+# SSDs keep dozens of small reads in flight, so even few cores get 32 threads
+IO_WORKERS = max(32, (os.cpu_count() or 1) * 2)
+
+def _default_workers() -> int:
+    """In-flight AI requests; matches the Ollama server's parallel request slots"""
+    try:
+        workers = int(os.environ.get("OLLAMA_NUM_PARALLEL", ""))
+    except ValueError:
+        return 4
+    # 0 lets the server pick its own default, which this side cannot know
+    return workers if workers >= 1 else 4
+
+
+DEFAULT_WORKERS = _default_workers()
+
+# Keep the model loaded for the whole run instead of letting it idle out between
+# requests; it is unloaded explicitly once analysis is done
+KEEP_ALIVE = "30m"
+
+# Characters of text content sent to the model per file
+CONTENT_SAMPLE_CHARS = 400
+
+# Context window sized to the prompt instead of the model default: instructions
+# plus, per file, its content, name and type line, and its answer. A token spans
+# at least one character, so the character caps bound the content tokens. Ollama
+# reloads the model whenever num_ctx changes, so one run uses a single value.
+NUM_CTX_BASE = 256
+NUM_CTX_FILE_OVERHEAD = 48
+NUM_CTX_PER_FILE = CONTENT_SAMPLE_CHARS + NUM_CTX_FILE_OVERHEAD + ANALYSIS_NUM_PREDICT
+
+# Batched prompts carry a short excerpt per file; fallbacks to single-file prompts remain
+DEFAULT_BATCH_SIZE = 16
+BATCH_CONTENT_CHARS = CONTENT_SAMPLE_CHARS // 2
+NUM_CTX_PER_BATCHED_FILE = BATCH_CONTENT_CHARS + NUM_CTX_FILE_OVERHEAD + ANALYSIS_NUM_PREDICT
+
+# Bound on files discovered but not yet picked up for analysis. Together with
+# releasing each file's staged data once its analysis is final, this keeps the
+# pipeline's memory proportional to the files in flight (plus those awaiting
+# escalation) rather than to the tree size; only the results themselves grow
+PIPELINE_QUEUE_SIZE = 128
+
+# Discovered files are classified without the AI in chunks of this size, spread
+# over the extraction pool
+PARTITION_CHUNK_SIZE = 64
+
+# Small int4 quant for the first pass; only low-confidence files reach the larger model
+DEFAULT_MODEL = "llama3.2:1b-instruct-q4_K_M"
+DEFAULT_ESCALATION_MODEL = "llama3.2:3b-instruct-q4_K_M"
+DEFAULT_ESCALATION_THRESHOLD = 60
+
+# Never organized: tool/system directories and OS metadata files (hidden entries are skipped too)
+SKIPPED_DIRECTORIES = frozenset({'__pycache__', 'node_modules'})
+SKIPPED_FILES = frozenset({'Thumbs.db', 'Desktop.ini'})
+
+# Extension-based file type detection when python-magic is unavailable
+TEXT_EXTENSIONS = frozenset({'.txt', '.md', '.py', '.js', '.html', '.css', '.json', '.xml', '.yml', '.yaml', '.csv'})
+IMAGE_EXTENSIONS = frozenset({'.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff'})
+VIDEO_EXTENSIONS = frozenset({'.mp4', '.avi', '.mov', '.mkv', '.wmv'})
+AUDIO_EXTENSIONS = frozenset({'.mp3', '.wav', '.flac', '.ogg'})
+
+# Extensions that determine the category on their own; these files skip the LLM
+EXTENSION_CATEGORIES = {
+    '.py': ('Code Projects', 'Python Scripts'),
+    '.js': ('Code Projects', 'JavaScript'),
+    '.ts': ('Code Projects', 'TypeScript'),
+    '.java': ('Code Projects', 'Java'),
+    '.c': ('Code Projects', 'C'),
+    '.cpp': ('Code Projects', 'C++'),
+    '.go': ('Code Projects', 'Go'),
+    '.rs': ('Code Projects', 'Rust'),
+    '.sh': ('Code Projects', 'Shell Scripts'),
+    '.jpg': ('Media', 'Images'),
+    '.jpeg': ('Media', 'Images'),
+    '.png': ('Media', 'Images'),
+    '.gif': ('Media', 'Images'),
+    '.bmp': ('Media', 'Images'),
+    '.tiff': ('Media', 'Images'),
+    '.heic': ('Media', 'Images'),
+    '.webp': ('Media', 'Images'),
+    '.mp4': ('Media', 'Video'),
+    '.avi': ('Media', 'Video'),
+    '.mov': ('Media', 'Video'),
+    '.mkv': ('Media', 'Video'),
+    '.wmv': ('Media', 'Video'),
+    '.mp3': ('Media', 'Audio'),
+    '.wav': ('Media', 'Audio'),
+    '.flac': ('Media', 'Audio'),
+    '.ogg': ('Media', 'Audio'),
+    '.m4a': ('Media', 'Audio'),
+    '.pdf': ('Documents', 'PDF Documents'),
+    '.zip': ('Archives', 'Compressed Files'),
+    '.gz': ('Archives', 'Compressed Files'),
+    '.tar': ('Archives', 'Compressed Files'),
+    '.7z': ('Archives', 'Compressed Files'),
+    '.rar': ('Archives', 'Compressed Files'),
+    '.tgz': ('Archives', 'Compressed Files'),
+    '.bz2': ('Archives', 'Compressed Files'),
+    '.xz': ('Archives', 'Compressed Files'),
+}
+# MIME types (or type prefixes) for which extraction yields only type and size,
+# so the LLM has nothing to analyze beyond what this table already says
+MIME_CATEGORIES = {
+    'image/': ('Media', 'Images'),
+    'video/': ('Media', 'Video'),
+    'audio/': ('Media', 'Audio'),
+    'application/pdf': ('Documents', 'PDF Documents'),
+}
+# Container MIME types. Office documents, jars and other formats built on ZIP
+# sniff as application/zip, so these are only trusted for files without an extension.
+ARCHIVE_MIME_CATEGORIES = {
+    'application/zip': ('Archives', 'Compressed Files'),
+    'application/gzip': ('Archives', 'Compressed Files'),
+    'application/x-gzip': ('Archives', 'Compressed Files'),
+    'application/x-bzip2': ('Archives', 'Compressed Files'),
+    'application/x-xz': ('Archives', 'Compressed Files'),
+    'application/x-tar': ('Archives', 'Compressed Files'),
+    'application/x-7z-compressed': ('Archives', 'Compressed Files'),
+    'application/x-rar': ('Archives', 'Compressed Files'),
+    'application/vnd.rar': ('Archives', 'Compressed Files'),
+}
+FAST_CLASSIFY_CONFIDENCE = 95
+
+# Structured text where the start (imports, preamble) and end (main block, schema) say the most
+HEAD_TAIL_EXTENSIONS = frozenset({'.py', '.js', '.md', '.json', '.xml', '.yml', '.yaml', '.html', '.css', '.csv'})
+
+# Leading bytes read once per file, for MIME sniffing and the content sample
+HEAD_BYTES = 4096
+
+# A head made almost entirely of these bytes (tab, newline, carriage return,
+# printable ASCII) is treated as plain text without consulting libmagic
+_TEXT_BYTES = bytes([9, 10, 13]) + bytes(range(32, 127))
+TEXT_PRINTABLE_RATIO = 0.95
+
+# Embedding-based clustering (--cluster): one embedding per file, one LLM call per cluster
+DEFAULT_EMBEDDING_MODEL = "nomic-embed-text"
+CLUSTER_MIN_SIZE = 3
+CLUSTER_SAMPLE_FILES = 3
+CLUSTER_SNIPPET_CHARS = 300
+
+# Placeholder subcategories that do not get a folder of their own
+NON_FOLDER_SUBCATEGORIES = frozenset({'Unknown', 'Analysis Failed', 'Error'})
+
+# Per-file progress is reported every PROGRESS_UPDATE_EVERY files, redrawn at a capped rate
+PROGRESS_UPDATE_EVERY = 16
+PROGRESS_REFRESH_PER_SECOND = 10
+
+DEFAULT_CACHE_PATH = Path.home() / ".cache" / "file_organizer" / "analysis.sqlite"
+# Leading bytes hashed (with the file size) to key the analysis cache
+CACHE_KEY_BYTES = 65536
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def _chunked(items: Iterable, size: int) -> Iterator[List]:
+    """Split items into consecutive lists of at most size elements"""
+    iterator = iter(items)
+    return iter(lambda: list(itertools.islice(iterator, size)), [])
+
+
+def _extension(file_path: str) -> str:
+    """Lower-cased extension of a path string"""
+    return os.path.splitext(file_path)[1].lower()
+
+
+def _looks_like_text(head: bytes) -> bool:
+    """Whether at least TEXT_PRINTABLE_RATIO of head is plain-text bytes
+    
+    bytes.translate drops the text bytes in C, so only the remainder is
+    counted in Python.
+    """
+    return bool(head) and len(head.translate(None, _TEXT_BYTES)) <= len(head) * (1 - TEXT_PRINTABLE_RATIO)
+
+
+@functools.lru_cache(maxsize=4096)
+def _detect_mime(path: str, mtime_ns: int, size: int) -> str:
+    """MIME type of a file, by content when python-magic is available
+    
+    mtime_ns and size are only part of the cache key, so an edited file is
+    detected again.
+    """
+    if HAS_MAGIC:
+        head = _read_head(path, mtime_ns, size)
+        # Obvious text is the common case and needs no libmagic lookup
+        return 'text/plain' if _looks_like_text(head) else _MIME_DETECTOR.from_buffer(head)
+    
+    # Fallback: basic extension-based detection
+    ext = _extension(path)
+    if ext in TEXT_EXTENSIONS:
+        return 'text/plain'
+    elif ext in IMAGE_EXTENSIONS:
+        return 'image/jpeg'
+    elif ext in VIDEO_EXTENSIONS:
+        return 'video/mp4'
+    elif ext in AUDIO_EXTENSIONS:
+        return 'audio/mpeg'
+    elif ext == '.pdf':
+        return 'application/pdf'
+    elif _looks_like_text(_read_head(path, mtime_ns, size)):
+        return 'text/plain'
+    return 'application/octet-stream'
+
+
+@functools.lru_cache(maxsize=256)
+def _read_head(path: str, mtime_ns: int, size: int) -> bytes:
+    """First HEAD_BYTES of a file, shared by MIME detection and content extraction
+    
+    One binary read; nothing is decoded here. Only needs to outlive the
+    extraction of one file, hence the small cache.
+    """
+    with open(path, 'rb') as f:
+        return f.read(HEAD_BYTES)
+
+
+@functools.lru_cache(maxsize=4096)
+def _read_text_sample(path: str, mtime_ns: int, size: int, max_bytes: int) -> str:
+    """Read the part of a text file that is sent to the AI
+    
+    At most max_bytes are sampled: structured files larger than that
+    contribute half from their start and half from their end, other files
+    their first max_bytes. Bytes are read in binary and decoded once, so a
+    huge or mislabeled file costs no more than its sample. Cached like
+    _detect_mime.
+    """
+    head = _read_head(path, mtime_ns, size)
+    head_tail = _extension(path) in HEAD_TAIL_EXTENSIONS and size > max_bytes
+    head_bytes = max_bytes - max_bytes // 2 if head_tail else max_bytes
+    
+    if head_bytes <= len(head) or len(head) == size:
+        raw = head[:head_bytes]
+    else:
+        with open(path, 'rb') as f:
+            raw = f.read(head_bytes)
+    if not head_tail:
+        return raw.decode('utf-8', errors='ignore')
+    
+    with open(path, 'rb') as f:
+        f.seek(-(max_bytes // 2), os.SEEK_END)
+        tail = f.read(max_bytes // 2)
+    return raw.decode('utf-8', errors='ignore') + "\n[...]\n" + tail.decode('utf-8', errors='ignore')
+
+
+def _extract_json(text: str) -> Optional[str]:
+    """Return the first balanced {...} object in text, or None
+    
+    A single linear scan tracking brace depth, ignoring braces inside JSON
+    strings. With structured output the object starts at the first character.
+    """
+    start = text.find('{')
+    if start == -1:
+        return None
+    
+    depth = 0
+    in_string = False
+    escaped = False
+    for i in range(start, len(text)):
+        char = text[i]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == '{':
+            depth += 1
+        elif char == '}':
+            depth -= 1
+            if depth == 0:
+                return text[start:i + 1]
+    return None
+
+
+def _parse_json_object(text: str) -> Optional[Dict]:
+    """Parse a model response into a JSON object, or None
+    
+    Structured output is parsed directly; the brace scan is only a safety net
+    for models that wrap the object in prose.
+    """
+    try:
+        value = json.loads(text)
+    except json.JSONDecodeError:
+        json_text = _extract_json(text)
+        try:
+            value = json.loads(json_text) if json_text else None
+        except json.JSONDecodeError:
+            value = None
+    return value if isinstance(value, dict) else None
+
+
+def _confidence(analysis: Dict) -> int:
+    """Confidence of an analysis as an int clamped to 0-100; 0 if missing or not a number
+    
+    Models occasionally answer "85" or null despite the schema.
+    """
+    try:
+        return min(max(int(analysis.get('confidence', 0)), 0), 100)
+    except (TypeError, ValueError):
+        return 0
+
+
+class AnalysisCache:
+    """Persistent SQLite cache of AI analyses keyed by model and file content
+    
+    Exact hits are looked up by a hash of the file's leading bytes and size,
+    so a hit needs no content extraction. On a miss, recent entries are
+    scanned for a near-duplicate using a 64-bit SimHash of the extracted
+    content words.
+    """
+    
+    FUZZY_MAX_DISTANCE = 3
+    FUZZY_SCAN_LIMIT = 512
+    FUZZY_MIN_WORDS = 20
+    
+    def __init__(self, db_path: Path = DEFAULT_CACHE_PATH):
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.connection = sqlite3.connect(str(db_path), check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.connection:
+            # WAL lets concurrent runs read the cache while another one writes
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS cache "
+                "(key TEXT, model TEXT, simhash INTEGER, json TEXT, PRIMARY KEY (key, model))"
+            )
+    
+    @staticmethod
+    def file_key(file_path: str, size: int) -> str:
+        """Content key of a file: hash of its first CACHE_KEY_BYTES and its size"""
+        with open(file_path, 'rb') as f:
+            head = f.read(CACHE_KEY_BYTES)
+        return hashlib.blake2b(head + str(size).encode(), digest_size=16).hexdigest()
+    
+    @staticmethod
+    def _simhash(words: List[str]) -> int:
+        """64-bit SimHash, stored as a signed integer to fit SQLite's INTEGER"""
+        weights = [0] * 64
+        for word in words:
+            word_hash = int.from_bytes(hashlib.blake2b(word.encode(), digest_size=8).digest(), 'big')
+            for bit in range(64):
+                weights[bit] += 1 if word_hash >> bit & 1 else -1
+        value = sum(1 << bit for bit in range(64) if weights[bit] > 0)
+        return value - (1 << 64) if value >= 1 << 63 else value
+    
+    @staticmethod
+    @functools.lru_cache(maxsize=1024)
+    def _content_simhash(content: str) -> Optional[int]:
+        """SimHash of the content words, or None if too short for fuzzy matching
+        
+        Memoized so a lookup miss and the following store tokenize only once.
+        """
+        words = _WORD_RE.findall(content.lower())
+        if len(words) < AnalysisCache.FUZZY_MIN_WORDS:
+            return None
+        return AnalysisCache._simhash(words)
+    
+    def lookup(self, model_name: str, key: str) -> Optional[Dict]:
+        """Return the cached analysis of a file with this content key"""
+        try:
+            with self.lock:
+                row = self.connection.execute(
+                    "SELECT json FROM cache WHERE key = ? AND model = ?", (key, model_name)
+                ).fetchone()
+            return json.loads(row[0]) if row else None
+        except (sqlite3.Error, ValueError):
+            return None
+    
+    def lookup_similar(self, model_name: str, content: str) -> Optional[Dict]:
+        """Return a cached analysis of near-identical extracted content"""
+        try:
+            simhash = self._content_simhash(content)
+            if simhash is None:
+                return None
+            
+            with self.lock:
+                recent = self.connection.execute(
+                    "SELECT simhash, json FROM cache WHERE model = ? AND simhash IS NOT NULL "
+                    "ORDER BY rowid DESC LIMIT ?",
+                    (model_name, self.FUZZY_SCAN_LIMIT)
+                )
+                for other_simhash, cached_json in recent:
+                    if bin((simhash ^ other_simhash) & ((1 << 64) - 1)).count('1') <= self.FUZZY_MAX_DISTANCE:
+                        return json.loads(cached_json)
+        except (sqlite3.Error, ValueError):
+            pass
+        return None
+    
+    def store(self, model_name: str, key: str, content: str, analysis: Dict):
+        """Store a successful analysis"""
+        self.store_many(model_name, [(key, content, analysis)])
+    
+    def store_many(self, model_name: str, entries: List[Tuple[str, str, Dict]]):
+        """Store (key, content, analysis) entries in a single transaction"""
+        try:
+            with self.lock, self.connection:
+                self.connection.executemany(
+                    "INSERT OR REPLACE INTO cache (key, model, simhash, json) VALUES (?, ?, ?, ?)",
+                    [(key, model_name, self._content_simhash(content), json.dumps(analysis))
+                     for key, content, analysis in entries]
+                )
+        except sqlite3.Error:
+            pass
+
 
 class FileContentAnalyzer:
     """Analyzes file content using local AI to determine categories"""
     
-    def __init__(self, model_name: str = "llama3.2:1b"):
+    def __init__(self, model_name: str = DEFAULT_MODEL, cache_path: Optional[Path] = DEFAULT_CACHE_PATH,
+                 escalation_model: Optional[str] = DEFAULT_ESCALATION_MODEL):
         self.model_name = model_name
+        self.escalation_model = escalation_model
+        self.embedding_model: Optional[str] = None
+        self.num_ctx = NUM_CTX_BASE + NUM_CTX_PER_FILE
         self.client = ollama.Client()
+        self._async_client: Optional[ollama.AsyncClient] = None
+        self._async_client_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._content_cache: Dict[str, str] = {}
+        self._cache_keys: Dict[str, Optional[str]] = {}
+        # Exact cache lookups done by stage(), None for a miss; analyze_batch consumes them
+        self._staged_hits: Dict[str, Optional[Dict]] = {}
+        # Content extraction never shares threads with the AI request pipeline
+        self._io_executor = ThreadPoolExecutor(max_workers=IO_WORKERS, thread_name_prefix="extract")
+        # stat results recorded during discovery, so extraction needs no second stat()
+        self.file_stats: Dict[str, os.stat_result] = {}
+        
+        self.cache = None
+        if cache_path is not None:
+            try:
+                self.cache = AnalysisCache(cache_path)
+            except (OSError, sqlite3.Error) as e:
+                console.print(f"[yellow]Warning: analysis cache disabled ({e})")
         
+    @property
+    def async_client(self) -> ollama.AsyncClient:
+        """Async client for analysis requests, bound to the running event loop
+        
+        The underlying HTTP connections belong to one event loop, so a new
+        client is created for each asyncio.run().
+        """
+        loop = asyncio.get_running_loop()
+        if self._async_client_loop is not loop:
+            self._async_client = ollama.AsyncClient()
+            self._async_client_loop = loop
+        return self._async_client
+    
     def verify_local_ai_connection(self) -> bool:
-        """Verify that local AI (Ollama) is running and model is available"""
+        """Verify that local AI (Ollama) is running and the models are available"""
         try:
             models_response = self.client.list()
             
@@ -56,100 +554,237 @@ class FileContentAnalyzer:
             else:
                 available_models = []
                 
-            if self.model_name not in available_models:
-                console.print(f"[yellow]Model {self.model_name} not found. Available models: {available_models}")
-                console.print(f"[blue]Attempting to pull {self.model_name}...")
-                self.client.pull(self.model_name)
+            for model_name in filter(None, [self.model_name, self.escalation_model, self.embedding_model]):
+                if model_name not in available_models:
+                    console.print(f"[yellow]Model {model_name} not found. Available models: {available_models}")
+                    console.print(f"[blue]Attempting to pull {model_name}...")
+                    self.client.pull(model_name)
+            
+            # Load the weights now rather than during the first analysis
+            self.client.generate(model=self.model_name, prompt="", keep_alive=KEEP_ALIVE,
+                                 options={"num_ctx": self.num_ctx})
             return True
         except Exception as e:
             console.print(f"[red]Error connecting to local AI (Ollama): {e}")
             return False
     
-    def extract_file_content(self, file_path: Path, max_chars: int = 2000) -> str:
-        """Extract file content for AI analysis - actual content, not just extension"""
+    def unload_models(self):
+        """Free the memory of the models this run loaded instead of holding it for KEEP_ALIVE"""
         try:
-            # Detect file type by content, not extension
-            if HAS_MAGIC:
-                file_type = magic.from_file(str(file_path), mime=True)
-            else:
-                # Fallback: basic extension-based detection
-                ext = file_path.suffix.lower()
-                if ext in ['.txt', '.md', '.py', '.js', '.html', '.css', '.json', '.xml', '.yml', '.yaml', '.csv']:
-                    file_type = 'text/plain'
-                elif ext in ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff']:
-                    file_type = 'image/jpeg'
-                elif ext in ['.mp4', '.avi', '.mov', '.mkv', '.wmv']:
-                    file_type = 'video/mp4'
-                elif ext in ['.mp3', '.wav', '.flac', '.ogg']:
-                    file_type = 'audio/mpeg'
-                elif ext == '.pdf':
-                    file_type = 'application/pdf'
+            loaded = {model.model for model in self.client.ps().models}
+            for model_name in filter(None, [self.model_name, self.escalation_model, self.embedding_model]):
+                if model_name not in loaded:
+                    continue
+                if model_name == self.embedding_model:
+                    self.client.embed(model=model_name, input="", keep_alive=0)
                 else:
-                    file_type = 'application/octet-stream'
+                    self.client.generate(model=model_name, prompt="", keep_alive=0)
+        except Exception:
+            # Ollama unloads idle models by itself after KEEP_ALIVE
+            pass
+    
+    def extract_file_content(self, file_path: str, st: Optional[os.stat_result] = None,
+                             max_chars: int = CONTENT_SAMPLE_CHARS) -> str:
+        """Extract file content for AI analysis - actual content, not just extension
+        
+        st defaults to the stat result recorded during discovery, if any.
+        """
+        try:
+            file_stat = st or self._file_stat(file_path)
+            size = file_stat.st_size
+            
+            # Detect file type by content, not extension
+            file_type = _detect_mime(file_path, file_stat.st_mtime_ns, size)
             
             # Read actual content for text files
             if file_type.startswith('text/') or file_type in ['application/json', 'application/xml']:
-                with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read(max_chars)
-                    return f"File type: {file_type}\nActual content:\n{content}"
+                content = _read_text_sample(file_path, file_stat.st_mtime_ns, size, max_chars)
+                return f"File type: {file_type}\nActual content:\n{content}"
             
             # Describe binary files by type and size
             elif file_type.startswith('image/'):
-                return f"Image file: {file_type}, Size: {file_path.stat().st_size} bytes"
+                return f"Image file: {file_type}, Size: {size} bytes"
             elif file_type.startswith('video/'):
-                return f"Video file: {file_type}, Size: {file_path.stat().st_size} bytes"
+                return f"Video file: {file_type}, Size: {size} bytes"
             elif file_type.startswith('audio/'):
-                return f"Audio file: {file_type}, Size: {file_path.stat().st_size} bytes"
+                return f"Audio file: {file_type}, Size: {size} bytes"
             elif file_type == 'application/pdf':
-                return f"PDF document, Size: {file_path.stat().st_size} bytes"
+                return f"PDF document, Size: {size} bytes"
             else:
-                return f"Binary file: {file_type}, Size: {file_path.stat().st_size} bytes"
+                # Leading magic bytes let the model tell e.g. ZIP from SQLite apart
+                magic_bytes = _read_head(file_path, file_stat.st_mtime_ns, size)[:16].hex()
+                return f"Binary file: {file_type}, Size: {size} bytes, Magic bytes: {magic_bytes}"
                 
         except Exception as e:
             return f"Error reading file content: {e}"
     
-    def analyze_content_for_category(self, file_path: Path) -> Dict:
-        """Analyze actual file content to suggest category - not based on extension"""
-        content_info = self.extract_file_content(file_path)
+    def _file_stat(self, file_path: str) -> os.stat_result:
+        """Stat result recorded during discovery, falling back to one stat() call
         
-        prompt = f"""
-        Analyze this file's ACTUAL CONTENT and suggest the best category for organization.
+        The fallback is recorded too, so MIME sniffing, extraction and the
+        cache key share a single syscall for files analyzed without discovery.
+        """
+        file_stat = self.file_stats.get(file_path)
+        if file_stat is None:
+            file_stat = self.file_stats[file_path] = os.stat(file_path)
+        return file_stat
+    
+    def _cache_key(self, file_path: str) -> Optional[str]:
+        """Analysis cache key of a file, computed once; None if it cannot be read"""
+        if file_path not in self._cache_keys:
+            try:
+                self._cache_keys[file_path] = AnalysisCache.file_key(file_path, self._file_stat(file_path).st_size)
+            except OSError:
+                self._cache_keys[file_path] = None
+        return self._cache_keys[file_path]
+    
+    def _cached_analysis(self, file_path: str, model_name: str) -> Optional[Dict]:
+        """Previous analysis of the exact same file content by the given model
+        
+        Needs only the cache key; load_cache_keys computes it off the event loop.
+        """
+        key = self._cache_key(file_path) if self.cache else None
+        return self.cache.lookup(model_name, key) if key else None
+    
+    def fast_classify(self, file_path: str) -> Optional[Dict]:
+        """Classify unambiguous file types without the LLM
         
-        File name: {file_path.name}
-        File location: {file_path}
-        {content_info}
+        Known extensions are looked up directly. Otherwise media and PDF files
+        are recognized by MIME type, since their extracted content is only the
+        type and size, as are archives without an extension. Returns None for
+        files that need content analysis (text, JSON/XML, unknown binaries,
+        ZIP-based formats such as .docx or .jar).
+        """
+        ext = _extension(file_path)
+        categories = EXTENSION_CATEGORIES.get(ext)
+        if categories is not None:
+            reason = f"Identified by {ext} file type"
+        else:
+            try:
+                file_stat = self._file_stat(file_path)
+                file_type = _detect_mime(file_path, file_stat.st_mtime_ns, file_stat.st_size)
+            except Exception:
+                return None
+            categories = next((categories for prefix, categories in MIME_CATEGORIES.items()
+                               if file_type.startswith(prefix)), None)
+            if categories is None and not ext:
+                categories = ARCHIVE_MIME_CATEGORIES.get(file_type)
+            if categories is None:
+                return None
+            reason = f"Identified by {file_type} content type"
         
-        Based on the ACTUAL CONTENT (not filename or extension), determine:
-        1. Main category (e.g., Work Documents, Personal Files, Code Projects, Media, etc.)
-        2. Subcategory if appropriate (e.g., Financial Reports, Python Scripts, Family Photos)
-        3. Confidence score (0-100) based on content analysis
-        4. Brief explanation of why this categorization fits the content
+        category, subcategory = categories
+        return {
+            "category": category,
+            "subcategory": subcategory,
+            "confidence": FAST_CLASSIFY_CONFIDENCE,
+            "reason": reason
+        }
+    
+    def fast_classify_all(self, files: List[str]) -> Iterator[Optional[Dict]]:
+        """fast_classify each file in the extraction pool, in order
         
-        Respond in JSON format only:
-        {{"category": "main_category", "subcategory": "sub_category", "confidence": 85, "reason": "explanation based on content analysis"}}
+        Files with inconclusive extensions have their head read for MIME
+        sniffing, which parallelizes like content extraction.
+        """
+        return self._io_executor.map(self.fast_classify, files)
+    
+    def _chat_options(self, num_predict: int) -> Dict:
+        """Generation options shared by all analysis requests"""
+        return {"temperature": 0.3, "num_ctx": self.num_ctx, "num_predict": num_predict}
+    
+    def _get_content(self, file_path: str) -> str:
+        """Return the kept content of a file, extracting and keeping it if needed (blocking)"""
+        content_info = self._content_cache.get(file_path)
+        if content_info is None:
+            content_info = self._content_cache[file_path] = self.extract_file_content(file_path)
+        return content_info
+    
+    def release(self, files: Iterable[str]):
+        """Drop the content, cache key and stat result kept for files whose analysis is final"""
+        for file_path in files:
+            self._content_cache.pop(file_path, None)
+            self._cache_keys.pop(file_path, None)
+            self._staged_hits.pop(file_path, None)
+            self.file_stats.pop(file_path, None)
+    
+    async def _run_in_io_pool(self, function, files: List[str]):
+        """Call function on each file in the extraction pool, keeping the event loop free"""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._io_executor, function, file_path)
+                               for file_path in files))
+    
+    async def load_cache_keys(self, files: List[str]):
+        """Hash the files not hashed yet, so exact cache lookups need no disk reads"""
+        if self.cache:
+            await self._run_in_io_pool(self._cache_key,
+                                       [file_path for file_path in files if file_path not in self._cache_keys])
+    
+    async def load_contents(self, files: List[str]) -> List[str]:
+        """Return the content of files, reading unstaged ones in worker threads
+        
+        Disk reads, stat() and libmagic run in the extraction pool, so the
+        event loop keeps serving in-flight AI requests meanwhile.
         """
+        await self._run_in_io_pool(self._get_content,
+                                   [file_path for file_path in files if file_path not in self._content_cache])
+        return [self._content_cache[file_path] for file_path in files]
+    
+    async def stage(self, files: List[str]):
+        """Read ahead what analyze_batch will need for files
         
+        Content is only extracted for files without an exact cache hit. The
+        lookups are kept, so analyze_batch does not repeat them.
+        """
+        await self.load_cache_keys(files)
+        for file_path in files:
+            self._staged_hits[file_path] = self._cached_analysis(file_path, self.model_name)
+        await self.load_contents([file_path for file_path in files if self._staged_hits[file_path] is None])
+    
+    async def analyze_content_for_category(self, file_path: str, model_name: Optional[str] = None) -> Dict:
+        """Analyze actual file content to suggest category - not based on extension
+        
+        model_name overrides the analyzer's model, e.g. for escalation.
+        """
+        model_name = model_name or self.model_name
+        await self.load_cache_keys([file_path])
+        cached = self._cached_analysis(file_path, model_name)
+        if cached is not None:
+            return cached
+        
+        content_info, = await self.load_contents([file_path])
+        cached = self.cache.lookup_similar(model_name, content_info) if self.cache else None
+        if cached is not None:
+            return cached
+        return await self._request_analysis(file_path, content_info, model_name)
+    
+    async def _request_analysis(self, file_path: str, content_info: str, model_name: str) -> Dict:
+        """Ask the AI about one file whose content missed the cache, and cache the answer"""
         try:
-            response = self.client.chat(
-                model=self.model_name,
-                messages=[{"role": "user", "content": prompt}],
-                options={"temperature": 0.3}
+            response = await self.async_client.chat(
+                model=model_name,
+                messages=[
+                    {"role": "system", "content": ANALYSIS_SYSTEM_PROMPT},
+                    {"role": "user", "content": f"{os.path.basename(file_path)}\n{content_info}"}
+                ],
+                format=ANALYSIS_SCHEMA,
+                options=self._chat_options(ANALYSIS_NUM_PREDICT),
+                keep_alive=KEEP_ALIVE
             )
             
-            response_text = response['message']['content']
-            
-            # Extract JSON from AI response
-            import re
-            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-            if json_match:
-                return json.loads(json_match.group())
-            else:
+            analysis = _parse_json_object(response['message']['content'])
+            if analysis is None:
                 return {
                     "category": "Uncategorized",
                     "subcategory": "Analysis Failed",
                     "confidence": 0,
                     "reason": "Could not parse AI response"
                 }
+            
+            key = self._cache_key(file_path) if self.cache else None
+            if key:
+                self.cache.store(model_name, key, content_info, analysis)
+            return analysis
                 
         except Exception as e:
             console.print(f"[red]Error analyzing content of {file_path}: {e}")
@@ -159,77 +794,514 @@ class FileContentAnalyzer:
                 "confidence": 0,
                 "reason": f"Analysis failed: {e}"
             }
+    
+    async def analyze_batch(self, files: List[str]) -> List[Dict]:
+        """Analyze several files with a single AI request
+        
+        Sharing one prompt amortizes the instruction prefill and the HTTP
+        round-trip across the batch. Files the model leaves out of its answer
+        are retried individually.
+        """
+        results: Dict[int, Dict] = {}
+        contents = {}
+        
+        await self.load_cache_keys(files)
+        for index, file_path in enumerate(files):
+            if file_path in self._staged_hits:
+                cached = self._staged_hits.pop(file_path)
+            else:
+                cached = self._cached_analysis(file_path, self.model_name)
+            if cached is not None:
+                results[index] = cached
+        
+        # Only exact-cache misses are extracted; near-duplicates may still hit
+        misses = [index for index in range(len(files)) if index not in results]
+        for index, content_info in zip(misses, await self.load_contents([files[index] for index in misses])):
+            cached = self.cache.lookup_similar(self.model_name, content_info) if self.cache else None
+            if cached is not None:
+                results[index] = cached
+            else:
+                contents[index] = content_info
+        
+        if len(contents) == 1:
+            index, content_info = next(iter(contents.items()))
+            results[index] = await self._request_analysis(files[index], content_info, self.model_name)
+        elif contents:
+            # The instructions are sent once; each file adds only its name and a short excerpt
+            file_summaries = json.dumps([
+                {"id": index, "name": os.path.basename(files[index]), "content": content_info[:BATCH_CONTENT_CHARS]}
+                for index, content_info in contents.items()
+            ], ensure_ascii=False)
+            
+            try:
+                response = await self.async_client.chat(
+                    model=self.model_name,
+                    messages=[
+                        {"role": "system", "content": BATCH_ANALYSIS_SYSTEM_PROMPT},
+                        {"role": "user", "content": file_summaries}
+                    ],
+                    format=BATCH_ANALYSIS_SCHEMA,
+                    options=self._chat_options(ANALYSIS_NUM_PREDICT * len(contents)),
+                    keep_alive=KEEP_ALIVE
+                )
+                
+                parsed = _parse_json_object(response['message']['content']) or {}
+                new_entries = []
+                for analysis in parsed.get('results', []):
+                    index = analysis.pop('id', None)
+                    if index in contents and index not in results:
+                        results[index] = analysis
+                        key = self._cache_key(files[index]) if self.cache else None
+                        if key:
+                            new_entries.append((key, contents[index], analysis))
+                if new_entries:
+                    self.cache.store_many(self.model_name, new_entries)
+                            
+            except Exception as e:
+                console.print(f"[yellow]Batch analysis failed, retrying files individually: {e}")
+        
+        # Left out of the batch answer; the cache was already checked for these
+        for index, content_info in contents.items():
+            if index not in results:
+                results[index] = await self._request_analysis(files[index], content_info, self.model_name)
+        return [results[index] for index in range(len(files))]
+    
+    def embed(self, file_path: str) -> Optional[List[float]]:
+        """Embed file content with the embedding model; None if the request fails"""
+        try:
+            response = self.client.embed(model=self.embedding_model or DEFAULT_EMBEDDING_MODEL,
+                                         input=self._get_content(file_path))
+            return list(response['embeddings'][0])
+        except Exception as e:
+            console.print(f"[red]Error embedding content of {file_path}: {e}")
+            return None
+    
+    def name_cluster(self, sample_files: List[str], cluster_size: int) -> Dict:
+        """Ask the AI for one category describing a cluster of similar files"""
+        file_summaries = "\n\n".join(
+            f"File name: {os.path.basename(file_path)}\n{self._get_content(file_path)[:CLUSTER_SNIPPET_CHARS]}"
+            for file_path in sample_files
+        )
+        
+        prompt = f"""
+        The files below are a sample from a group of {cluster_size} files with similar content.
+        Suggest the best category for organizing the whole group.
+        
+        {file_summaries}
+        
+        Based on the ACTUAL CONTENT (not filename or extension), determine:
+        1. Main category (e.g., Work Documents, Personal Files, Code Projects, Media, etc.)
+        2. Subcategory if appropriate (e.g., Financial Reports, Python Scripts, Family Photos)
+        3. Confidence score (0-100) that the category fits the whole group
+        4. Brief explanation of what the files have in common
+        
+        Respond in JSON format only:
+        {{"category": "main_category", "subcategory": "sub_category", "confidence": 85, "reason": "explanation based on content analysis"}}
+        """
+        
+        try:
+            response = self.client.chat(
+                model=self.model_name,
+                messages=[{"role": "user", "content": prompt}],
+                format=ANALYSIS_SCHEMA,
+                options=self._chat_options(128),
+                keep_alive=KEEP_ALIVE
+            )
+            analysis = _parse_json_object(response['message']['content'])
+            if analysis is None:
+                raise ValueError("Could not parse AI response")
+            return analysis
+        except Exception as e:
+            console.print(f"[red]Error naming cluster of {cluster_size} files: {e}")
+            return {
+                "category": "Uncategorized",
+                "subcategory": "Error",
+                "confidence": 0,
+                "reason": f"Analysis failed: {e}"
+            }
+
+
+@dataclass
+class AnalysisTable:
+    """Analysis results stored column-wise, one row per file
+    
+    Replaces a dict per file: the proposal and summary iterate the columns
+    they need with zip, and confidences take one byte each.
+    """
+    paths: List[Path] = field(default_factory=list)
+    categories: List[str] = field(default_factory=list)
+    subcategories: List[str] = field(default_factory=list)
+    confidences: array = field(default_factory=lambda: array('B'))
+    reasons: List[str] = field(default_factory=list)
+    
+    def __len__(self) -> int:
+        return len(self.paths)
+    
+    def append(self, file_path: Path, analysis: Dict):
+        """Add the row of one file from its analysis dict"""
+        # Thousands of rows share a few categories; interned, each is stored once
+        # and compares by identity in the proposal's dict lookups
+        self.paths.append(file_path)
+        self.categories.append(sys.intern(str(analysis.get('category') or 'Uncategorized')))
+        self.subcategories.append(sys.intern(str(analysis.get('subcategory') or '')))
+        self.confidences.append(_confidence(analysis))
+        self.reasons.append(str(analysis.get('reason') or ''))
+    
+    @classmethod
+    def from_results(cls, analysis_results: Dict[str, Dict]) -> 'AnalysisTable':
+        """Build a table with the rows in the order of analysis_results
+        
+        Analysis works on path strings; Path objects are only created here,
+        for the proposal, display and file moves.
+        """
+        table = cls()
+        for file_path, analysis in analysis_results.items():
+            table.append(Path(file_path), analysis)
+        return table
 
 
 class IntelligentFileOrganizer:
     """Main organizer that implements VG requirements"""
     
-    def __init__(self, target_directory: Path, interactive_mode: bool = True):
+    def __init__(self, target_directory: Path, interactive_mode: bool = True, max_workers: int = DEFAULT_WORKERS,
+                 use_cache: bool = True, batch_size: int = DEFAULT_BATCH_SIZE,
+                 escalation_threshold: int = DEFAULT_ESCALATION_THRESHOLD, use_fast_classify: bool = True):
         self.target_directory = Path(target_directory)
         self.interactive_mode = interactive_mode
-        self.analyzer = FileContentAnalyzer()
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.escalation_threshold = escalation_threshold
+        self.use_fast_classify = use_fast_classify
+        self._preparation_thread: Optional[threading.Thread] = None
+        self._prepared_names: Dict[Path, Set[str]] = {}
+        self._prepared_new_folders: List[Path] = []
+        self.analyzer = FileContentAnalyzer(cache_path=DEFAULT_CACHE_PATH if use_cache else None)
+        self.analyzer.num_ctx = NUM_CTX_BASE + max(NUM_CTX_PER_FILE, NUM_CTX_PER_BATCHED_FILE * batch_size)
         self.analysis_results = {}
         
-    def discover_all_files(self) -> List[Path]:
-        """Discover ALL files in folder structure - requirement: process all files"""
-        discovered_files = []
+    @staticmethod
+    def _scan_directory(directory: str) -> Tuple[List[str], List[Tuple[str, Optional[os.stat_result]]]]:
+        """Scan a single directory, returning its subdirectories and files
         
-        for root, dirs, filenames in os.walk(self.target_directory):
-            # Skip hidden directories and system directories
-            dirs[:] = [d for d in dirs if not d.startswith('.') and d not in ['__pycache__', 'node_modules']]
-            
-            for filename in filenames:
-                # Skip hidden files and system files
-                if filename.startswith('.') or filename in ['Thumbs.db', 'Desktop.ini']:
+        Files are regular files or symlinks to them, each with the stat result
+        cached on its DirEntry (None if it vanished before it could be stat'ed).
+        Symlinked directories, broken symlinks, FIFOs and sockets are skipped.
+        """
+        subdirectories = []
+        files = []
+        
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                # Skip hidden files and directories
+                if entry.name.startswith('.'):
                     continue
+                
+                # DirEntry type checks use the cached d_type, without a stat() for
+                # directories; symlinked directories are never descended into
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in SKIPPED_DIRECTORIES:
+                        subdirectories.append(entry.path)
+                elif entry.is_file() and entry.name not in SKIPPED_FILES:
+                    try:
+                        file_stat = entry.stat()
+                    except OSError:
+                        file_stat = None
+                    files.append((entry.path, file_stat))
                     
-                file_path = Path(root) / filename
-                discovered_files.append(file_path)
-                    
-        return discovered_files
+        return subdirectories, files
     
-    def analyze_all_content(self, files: List[Path]) -> Dict[Path, Dict]:
-        """Analyze actual content of all discovered files"""
-        analysis_results = {}
+    def discover_all_files(self) -> Iterator[str]:
+        """Discover ALL files in folder structure - requirement: process all files
+        
+        Directories are scanned by a pool of workers; every scanned directory
+        feeds its subdirectories back into the pool. Files are yielded as soon
+        as their directory has been scanned, in no particular order.
+        """
+        with ThreadPoolExecutor(max_workers=IO_WORKERS) as executor:
+            pending = {executor.submit(self._scan_directory, str(self.target_directory))}
+            
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        subdirectories, files = future.result()
+                    except OSError as e:
+                        console.print(f"[red]Error scanning directory: {e}")
+                        continue
+                    pending.update(executor.submit(self._scan_directory, d) for d in subdirectories)
+                    for file_path, file_stat in files:
+                        if file_stat is not None:
+                            self.analyzer.file_stats[file_path] = file_stat
+                        yield file_path
+    
+    def analyze_all_content(self, files: List[str]) -> AnalysisTable:
+        """Analyze actual content of all discovered files
+        
+        Files are grouped into batches of batch_size per prompt, and batches
+        are dispatched concurrently, at most max_workers in flight, so Ollama
+        can batch overlapping requests instead of idling between blocking
+        round-trips.
+        """
+        return AnalysisTable.from_results(asyncio.run(self._analyze_all_content(files)))
+    
+    def _partition_files(self, files: List[str]) -> Tuple[Dict[str, Dict], List[str]]:
+        """Split files into static analyses and the files that need the AI
+        
+        Known extensions, media, PDFs and archives are categorized from a
+        table; only text and unrecognized binaries are left for the AI.
+        """
+        if not self.use_fast_classify:
+            return {}, list(files)
+        
+        analysis_results, ai_files = {}, []
+        for file_path, fast_analysis in zip(files, self.analyzer.fast_classify_all(files)):
+            if fast_analysis:
+                analysis_results[file_path] = fast_analysis
+            else:
+                ai_files.append(file_path)
+        return analysis_results, ai_files
+    
+    async def _analyze_all_content(self, files: List[str]) -> Dict[str, Dict]:
+        # Unambiguous file types never reach the AI
+        analysis_results, ai_files = self._partition_files(files)
         
         console.print("[blue]Analyzing file content with local AI...[/blue]")
         
         with Progress(
             SpinnerColumn(),
             TextColumn("[progress.description]{task.description}"),
-            console=console
+            console=console,
+            refresh_per_second=PROGRESS_REFRESH_PER_SECOND
         ) as progress:
             task = progress.add_task("Content analysis in progress...", total=len(files))
+            progress.advance(task, len(analysis_results))
+            
+            batches = _chunked(ai_files, self.batch_size)
+            semaphore = asyncio.Semaphore(self.max_workers)
+            
+            async def analyze(batch: List[str]) -> Tuple[List[str], List[Dict]]:
+                # Extraction overlaps with the AI requests of earlier batches
+                await self.analyzer.stage(batch)
+                async with semaphore:
+                    return batch, await self.analyzer.analyze_batch(batch)
+            
+            for next_done in asyncio.as_completed([analyze(batch) for batch in batches]):
+                batch, analyses = await next_done
+                progress.update(task, description=f"Analyzed: {os.path.basename(batch[-1])}")
+                analysis_results.update(zip(batch, analyses))
+                progress.advance(task, len(batch))
+            
+            await self._escalate_low_confidence(analysis_results, progress, semaphore)
+        
+        # Keep discovery order for display and proposal generation
+        return {file_path: analysis_results[file_path] for file_path in files}
+    
+    def cluster_all_content(self, files: List[str]) -> AnalysisTable:
+        """Categorize files by clustering content embeddings
+        
+        Each file is embedded once, similar files are grouped with HDBSCAN and
+        the AI names each group from a few samples, so LLM calls drop from one
+        per file to one per cluster. Files outside any cluster, and clusters
+        the AI could not name, get the regular per-file analysis.
+        """
+        try:
+            import numpy as np
+            from sklearn.cluster import HDBSCAN
+        except ImportError:
+            console.print("[yellow]Warning: clustering needs numpy and scikit-learn>=1.3; analyzing files individually")
+            return self.analyze_all_content(files)
+        
+        analysis_results, ai_files = self._partition_files(files)
+        
+        # Embedding and cluster naming reuse the content extracted here in parallel
+        asyncio.run(self.analyzer.load_contents(ai_files))
+        remaining_files = ai_files
+        
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            console=console,
+            refresh_per_second=PROGRESS_REFRESH_PER_SECOND
+        ) as progress:
+            task = progress.add_task("Embedding file content...", total=len(ai_files))
+            embeddings = {}
+            
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(self.analyzer.embed, file_path): file_path for file_path in ai_files}
+                for done, future in enumerate(as_completed(futures), 1):
+                    vector = future.result()
+                    if vector is not None:
+                        embeddings[futures[future]] = vector
+                    if done % PROGRESS_UPDATE_EVERY == 0 or done == len(futures):
+                        progress.update(task, completed=done)
             
-            for file_path in files:
-                progress.update(task, description=f"Analyzing: {file_path.name}")
-                analysis_results[file_path] = self.analyzer.analyze_content_for_category(file_path)
-                progress.advance(task)
+            if len(embeddings) >= CLUSTER_MIN_SIZE:
+                embedded_files = [file_path for file_path in ai_files if file_path in embeddings]
+                X = np.stack([np.asarray(embeddings[file_path], dtype=np.float32) for file_path in embedded_files])
+                # Unit vectors make euclidean distance track cosine similarity
+                X /= np.maximum(np.linalg.norm(X, axis=1, keepdims=True), 1e-12)
+                labels = HDBSCAN(min_cluster_size=CLUSTER_MIN_SIZE, copy=False).fit(X).labels_
                 
-        return analysis_results
+                clusters: Dict[int, List[str]] = {}
+                for file_path, label in zip(embedded_files, labels):
+                    if label >= 0:  # -1 marks files outside every cluster
+                        clusters.setdefault(int(label), []).append(file_path)
+                
+                task = progress.add_task("Naming clusters...", total=len(clusters))
+                for members in clusters.values():
+                    analysis = self.analyzer.name_cluster(members[:CLUSTER_SAMPLE_FILES], len(members))
+                    if _confidence(analysis) > 0:
+                        for file_path in members:
+                            analysis_results[file_path] = dict(analysis)
+                    progress.advance(task)
+                
+                remaining_files = [file_path for file_path in ai_files if file_path not in analysis_results]
+        
+        if remaining_files:
+            analysis_results.update(asyncio.run(self._analyze_all_content(remaining_files)))
+        
+        return AnalysisTable.from_results(dict(sorted(analysis_results.items())))
+    
+    def run_pipeline(self) -> AnalysisTable:
+        """Discover and analyze all files in one overlapped pipeline
+        
+        The directory walk runs in an executor thread and feeds discovered
+        files into a bounded asyncio queue while max_workers consumer
+        coroutines take batches off it, so analysis starts with the first file
+        found instead of after a full filesystem scan.
+        """
+        return asyncio.run(self._run_pipeline())
+    
+    async def _run_pipeline(self) -> AnalysisTable:
+        loop = asyncio.get_running_loop()
+        files_queue: asyncio.Queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+        analysis_results = {}
+        
+        def walk() -> int:
+            """Route discovered files to the results or the queue; returns their count"""
+            discovered = 0
+            for chunk in _chunked(self.discover_all_files(), PARTITION_CHUNK_SIZE):
+                discovered += len(chunk)
+                fast_results, ai_files = self._partition_files(chunk)
+                # Unambiguous file types go straight to the results
+                analysis_results.update(fast_results)
+                self.analyzer.release(fast_results)
+                for file_path in ai_files:
+                    # Blocks this thread, not the event loop, while the queue is full
+                    asyncio.run_coroutine_threadsafe(files_queue.put(file_path), loop).result()
+            return discovered
+        
+        with Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            MofNCompleteColumn(),
+            console=console,
+            refresh_per_second=PROGRESS_REFRESH_PER_SECOND
+        ) as progress:
+            # Indeterminate until the walk has finished and the total is known
+            task = progress.add_task("Discovering and analyzing files...", total=None)
+            
+            async def produce():
+                try:
+                    total = await loop.run_in_executor(None, walk)
+                    progress.update(task, total=total, completed=len(analysis_results),
+                                    description="Analyzing files...")
+                finally:
+                    # One sentinel per consumer signals completion
+                    for _ in range(self.max_workers):
+                        await files_queue.put(None)
+            
+            async def consume():
+                finished = False
+                while not finished:
+                    # Wait for one file, then take whatever else is queued up to batch_size
+                    batch = []
+                    file_path = await files_queue.get()
+                    while file_path is not None:
+                        batch.append(file_path)
+                        if len(batch) == self.batch_size or files_queue.empty():
+                            break
+                        file_path = files_queue.get_nowait()
+                    finished = file_path is None
+                    
+                    if batch:
+                        analyses = await self.analyzer.analyze_batch(batch)
+                        analysis_results.update(zip(batch, analyses))
+                        # Only files that will be escalated are analyzed again
+                        self.analyzer.release(file_path for file_path, analysis in zip(batch, analyses)
+                                              if not self._needs_escalation(analysis))
+                        progress.update(task, completed=len(analysis_results),
+                                        description=f"Analyzed: {os.path.basename(batch[-1])}")
+            
+            await asyncio.gather(produce(), *[consume() for _ in range(self.max_workers)])
+            
+            await self._escalate_low_confidence(analysis_results, progress, asyncio.Semaphore(self.max_workers))
+            self.analyzer.release(list(analysis_results))
+        
+        # Files arrive in completion order; keep the result stable between runs
+        return AnalysisTable.from_results(dict(sorted(analysis_results.items())))
+    
+    def _needs_escalation(self, analysis: Dict) -> bool:
+        """Whether an analysis will be redone by the escalation model"""
+        escalation_model = self.analyzer.escalation_model
+        return (bool(escalation_model) and escalation_model != self.analyzer.model_name
+                and self.escalation_threshold > 0 and _confidence(analysis) < self.escalation_threshold)
+    
+    async def _escalate_low_confidence(self, analysis_results: Dict[str, Dict], progress: Progress,
+                                       semaphore: asyncio.Semaphore):
+        """Re-analyze low-confidence results with the larger escalation model"""
+        escalation_model = self.analyzer.escalation_model
+        low_confidence_files = [
+            file_path for file_path, analysis in analysis_results.items()
+            if self._needs_escalation(analysis)
+        ]
+        if not low_confidence_files:
+            return
+        
+        task = progress.add_task(f"Re-analyzing with {escalation_model}...", total=len(low_confidence_files))
+        
+        async def escalate(file_path: str) -> Tuple[str, Dict]:
+            async with semaphore:
+                return file_path, await self.analyzer.analyze_content_for_category(file_path, escalation_model)
+        
+        pending = [escalate(file_path) for file_path in low_confidence_files]
+        for done, next_done in enumerate(asyncio.as_completed(pending), 1):
+            file_path, escalated = await next_done
+            # Keep the first answer if the larger model did no better (e.g. it failed)
+            if _confidence(escalated) >= _confidence(analysis_results[file_path]):
+                analysis_results[file_path] = escalated
+            if done % PROGRESS_UPDATE_EVERY == 0 or done == len(pending):
+                progress.update(task, completed=done)
     
-    def generate_organization_proposal(self, analysis_results: Dict[Path, Dict]) -> Dict[str, List[Tuple[Path, str]]]:
-        """Generate organization proposal based on content analysis"""
+    def generate_organization_proposal(self, analysis_results: AnalysisTable) -> Dict[str, List[Tuple[Path, str]]]:
+        """Generate organization proposal based on content analysis
+        
+        Files share a handful of categories, so each folder name is built once
+        per distinct (category, subcategory) pair rather than once per file.
+        """
         organization_proposal = {}
+        folder_names: Dict[Tuple[str, str], str] = {}
         
-        for file_path, analysis in analysis_results.items():
-            category = analysis.get('category', 'Uncategorized')
-            subcategory = analysis.get('subcategory', '')
+        for file_path, category, subcategory, reason in zip(analysis_results.paths, analysis_results.categories,
+                                                           analysis_results.subcategories, analysis_results.reasons):
+            category_key = (category, subcategory)
             
-            # Create hierarchical folder structure
-            if subcategory and subcategory not in ['Unknown', 'Analysis Failed', 'Error']:
-                folder_structure = f"{category}/{subcategory}"
-            else:
-                folder_structure = category
-                
-            if folder_structure not in organization_proposal:
-                organization_proposal[folder_structure] = []
+            folder_structure = folder_names.get(category_key)
+            if folder_structure is None:
+                # Create hierarchical folder structure
+                if subcategory and subcategory not in NON_FOLDER_SUBCATEGORIES:
+                    folder_structure = f"{category}/{subcategory}"
+                else:
+                    folder_structure = category
+                folder_names[category_key] = folder_structure
+                organization_proposal.setdefault(folder_structure, [])
                 
-            organization_proposal[folder_structure].append((file_path, analysis.get('reason', '')))
+            organization_proposal[folder_structure].append((file_path, reason))
             
         return organization_proposal
     
-    def display_analysis_summary(self, analysis_results: Dict[Path, Dict]):
+    def display_analysis_summary(self, analysis_results: AnalysisTable):
         """Display content analysis results"""
         table = Table(title="Content Analysis Results")
         table.add_column("File", style="cyan", min_width=20)
@@ -238,48 +1310,122 @@ class IntelligentFileOrganizer:
         table.add_column("Confidence", style="yellow", min_width=10)
         table.add_column("Content-Based Reasoning", style="white", min_width=30)
         
-        for file_path, analysis in analysis_results.items():
-            reason = analysis.get('reason', 'No explanation provided')
+        for file_path, category, subcategory, confidence, reason in zip(
+                analysis_results.paths, analysis_results.categories, analysis_results.subcategories,
+                analysis_results.confidences, analysis_results.reasons):
+            reason = reason or 'No explanation provided'
             truncated_reason = reason[:47] + "..." if len(reason) > 50 else reason
             
             table.add_row(
                 str(file_path.relative_to(self.target_directory)),
-                analysis.get('category', 'Unknown'),
-                analysis.get('subcategory', 'Unknown'),
-                f"{analysis.get('confidence', 0)}%",
+                category,
+                subcategory or 'Unknown',
+                f"{confidence}%",
                 truncated_reason
             )
             
         console.print(table)
     
-    def display_organization_proposal(self, proposal: Dict[str, List[Tuple[Path, str]]]):
+    def display_organization_proposal(self, proposal: Dict[str, List[Tuple[Path, str]]],
+                                      total_files: Optional[int] = None):
         """Display the proposed organization structure"""
+        if total_files is None:
+            total_files = sum(map(len, proposal.values()))
+        
         console.print("\n[blue]Proposed Organization Structure:[/blue]")
         console.print("Based on content analysis, the following organization is suggested:\n")
         
-        for folder_name, files in proposal.items():
-            console.print(f"  [bold blue]{folder_name}[/bold blue]: {len(files)} files")
+        # One write for the whole listing instead of one per folder
+        console.print("\n".join(
+            f"  [bold blue]{folder_name}[/bold blue]: {len(files)} files" for folder_name, files in proposal.items()
+        ))
             
         console.print(f"\nTotal categories proposed: {len(proposal)}")
-        console.print(f"Total files to organize: {sum(len(files) for files in proposal.values())}")
+        console.print(f"Total files to organize: {total_files}")
     
-    def request_sorting_policy_approval(self, proposal: Dict[str, List[Tuple[Path, str]]]) -> bool:
-        """Request user approval of the sorting policy"""
+    def request_sorting_policy_approval(self, proposal: Dict[str, List[Tuple[Path, str]]],
+                                        dry_run: bool = False) -> bool:
+        """Request user approval of the sorting policy
+        
+        Unless this is a dry run, the target folders are prepared in the
+        background while the user decides, and removed again if declined.
+        """
+        if not dry_run:
+            self._preparation_thread = threading.Thread(
+                target=self.prepare_organization_plan, args=(proposal,), daemon=True
+            )
+            self._preparation_thread.start()
+        
         console.print("\n[yellow]SORTING POLICY APPROVAL REQUIRED[/yellow]")
         console.print("The AI has analyzed file content and proposes the above organization structure.")
         console.print("This will create new folders and move files based on their actual content.")
         
-        return Confirm.ask("\nDo you approve this sorting policy and want to proceed with organization?")
+        try:
+            approved = Confirm.ask("\nDo you approve this sorting policy and want to proceed with organization?")
+        except BaseException:
+            # Ctrl-C or a closed stdin must not leave the prepared folders behind
+            self.discard_prepared_organization_plan()
+            raise
+        if not approved:
+            self.discard_prepared_organization_plan()
+        return approved
+    
+    def prepare_organization_plan(self, proposal: Dict[str, List[Tuple[Path, str]]]):
+        """Create the target folders and list their existing names ahead of execution
+        
+        Folders created here are recorded so a declined plan leaves nothing behind.
+        """
+        organized_directory = self.target_directory / "organized_by_content"
+        
+        try:
+            for folder_name in proposal:
+                target_folder = organized_directory / folder_name
+                
+                # Create missing folders top-down, remembering which ones are new
+                for folder in reversed([target_folder, *target_folder.parents]):
+                    if folder == self.target_directory or self.target_directory not in folder.parents:
+                        continue
+                    try:
+                        folder.mkdir()
+                        self._prepared_new_folders.append(folder)
+                    except FileExistsError:
+                        pass
+                
+                self._prepared_names[target_folder] = set(os.listdir(target_folder))
+        except OSError:
+            # Whatever was not prepared is handled during execution
+            pass
+    
+    def _wait_for_preparation(self):
+        if self._preparation_thread is not None:
+            self._preparation_thread.join()
+            self._preparation_thread = None
+    
+    def discard_prepared_organization_plan(self):
+        """Remove folders created by prepare_organization_plan that are still empty"""
+        self._wait_for_preparation()
+        for folder in reversed(self._prepared_new_folders):
+            try:
+                folder.rmdir()
+            except OSError:
+                pass
+        self._prepared_new_folders = []
+        self._prepared_names = {}
     
     def execute_organization_plan(self, proposal: Dict[str, List[Tuple[Path, str]]], dry_run: bool = False):
         """Execute the approved organization plan"""
         organized_directory = self.target_directory / "organized_by_content"
+        self._wait_for_preparation()
         
         if not dry_run:
             organized_directory.mkdir(exist_ok=True)
         
         console.print("\n[green]Executing organization plan...[/green]")
         
+        # Next suffix to try per (folder, file name), so many files sharing a name
+        # do not each probe every suffix already handed out
+        next_counter: Dict[Tuple[Path, str], int] = {}
+        
         for folder_name, files in proposal.items():
             target_folder = organized_directory / folder_name
             
@@ -287,21 +1433,36 @@ class IntelligentFileOrganizer:
             console.print(f"Files to process: {len(files)}")
             
             if not dry_run:
-                target_folder.mkdir(parents=True, exist_ok=True)
+                # One listing per folder instead of an exists() probe per candidate name,
+                # usually already taken while the user reviewed the proposal
+                taken_names = self._prepared_names.pop(target_folder, None)
+                if taken_names is None:
+                    target_folder.mkdir(parents=True, exist_ok=True)
+                    taken_names = set(os.listdir(target_folder))
                 
                 for file_path, reason in files:
                     try:
-                        target_path = target_folder / file_path.name
+                        target_name = file_path.name
                         
-                        # Handle naming conflicts
-                        counter = 1
-                        while target_path.exists():
-                            stem = file_path.stem
-                            suffix = file_path.suffix
-                            target_path = target_folder / f"{stem}_{counter}{suffix}"
+                        # Handle naming conflicts; the final lexists() guards against
+                        # names that appeared after the folder was listed
+                        counter_key = (target_folder, file_path.name)
+                        counter = next_counter.get(counter_key, 1)
+                        while target_name in taken_names or os.path.lexists(target_folder / target_name):
+                            target_name = f"{file_path.stem}_{counter}{file_path.suffix}"
                             counter += 1
+                        next_counter[counter_key] = counter
+                        target_path = target_folder / target_name
                         
-                        shutil.move(str(file_path), str(target_path))
+                        # The target lives inside the scanned tree, so this is normally a
+                        # single rename syscall; only a file on another mount is copied
+                        try:
+                            os.replace(file_path, target_path)
+                        except OSError as e:
+                            if e.errno != errno.EXDEV:
+                                raise
+                            shutil.move(os.fspath(file_path), os.fspath(target_path))
+                        taken_names.add(target_name)
                         console.print(f"  [green]Moved[/green] {file_path.name} -> {folder_name}/")
                         
                     except Exception as e:
@@ -318,8 +1479,25 @@ class IntelligentFileOrganizer:
 @click.option('--interactive', is_flag=True, default=True,
               help='Interactive mode: user approval required (default)')
 @click.option('--dry-run', is_flag=True, help='Show what would be done without moving files')
-@click.option('--model', default='llama3.2:1b', help='Local AI model to use for content analysis')
-def main(directory, headless, interactive, dry_run, model):
+@click.option('--model', default=DEFAULT_MODEL, show_default=True, help='Local AI model to use for content analysis')
+@click.option('--escalation-model', default=DEFAULT_ESCALATION_MODEL, show_default=True,
+              help="Larger model used to re-analyze low-confidence files ('' to disable)")
+@click.option('--escalation-threshold', default=DEFAULT_ESCALATION_THRESHOLD, show_default=True,
+              type=click.IntRange(0, 100), help='Confidence below which files are re-analyzed')
+@click.option('--workers', default=DEFAULT_WORKERS, show_default=True, type=click.IntRange(min=1),
+              help='Number of concurrent requests sent to the local AI (defaults to $OLLAMA_NUM_PARALLEL)')
+@click.option('--batch-size', default=DEFAULT_BATCH_SIZE, show_default=True, type=click.IntRange(min=1),
+              help='Number of files analyzed together in a single AI request')
+@click.option('--cluster', is_flag=True,
+              help='Group similar files by content embeddings and name each group with one AI call '
+                   '(requires numpy and scikit-learn)')
+@click.option('--embedding-model', default=DEFAULT_EMBEDDING_MODEL, show_default=True,
+              help='Local embedding model used with --cluster')
+@click.option('--no-fast-classify', is_flag=True,
+              help='Send every file to the AI, including types identified by extension alone')
+@click.option('--no-cache', is_flag=True, help='Always re-analyze files instead of reusing cached results')
+def main(directory, headless, interactive, dry_run, model, escalation_model, escalation_threshold,
+         workers, batch_size, cluster, embedding_model, no_fast_classify, no_cache):
     """
     Intelligent File Organizer
     
@@ -340,6 +1518,10 @@ def main(directory, headless, interactive, dry_run, model):
     console.print(f"Target directory: {directory}")
     console.print(f"Mode: {'Interactive (user approval required)' if mode else 'Headless (automatic execution)'}")
     console.print(f"Local AI model: {model}")
+    # A threshold of 0 disables escalation, so that model is never pulled or loaded
+    escalation_model = escalation_model if escalation_threshold > 0 else None
+    if escalation_model:
+        console.print(f"Escalation model: {escalation_model} (confidence < {escalation_threshold}%)")
     
     if dry_run:
         console.print("[yellow]DRY RUN MODE - No files will be moved[/yellow]")
@@ -351,8 +1533,14 @@ def main(directory, headless, interactive, dry_run, model):
     console.print("- Smart organization with user approval")
     
     # Initialize organizer
-    organizer = IntelligentFileOrganizer(Path(directory), interactive_mode=mode)
+    organizer = IntelligentFileOrganizer(Path(directory), interactive_mode=mode, max_workers=workers,
+                                         use_cache=not no_cache, batch_size=batch_size,
+                                         escalation_threshold=escalation_threshold,
+                                         use_fast_classify=not no_fast_classify)
     organizer.analyzer.model_name = model
+    organizer.analyzer.escalation_model = escalation_model or None
+    if cluster:
+        organizer.analyzer.embedding_model = embedding_model
     
     # Verify local AI connection
     console.print("\n[blue]Verifying local AI connection...[/blue]")
@@ -364,20 +1552,22 @@ def main(directory, headless, interactive, dry_run, model):
     
     console.print("[green]Local AI connection verified[/green]")
     
-    # Discover all files in folder structure
-    console.print("\n[blue]Discovering all files in folder structure...[/blue]")
-    all_files = organizer.discover_all_files()
-    console.print(f"Found {len(all_files)} files to analyze")
+    # Discover all files in folder structure and analyze their actual content as they are found
+    console.print("\n[blue]Discovering and analyzing all files in folder structure...[/blue]")
+    console.print("[yellow]Note: Categories are unknown at start - AI will determine organization[/yellow]")
     
-    if not all_files:
-        console.print("[yellow]No files found to organize[/yellow]")
-        return
+    if cluster:
+        analysis_results = organizer.cluster_all_content(sorted(organizer.discover_all_files()))
+    else:
+        analysis_results = organizer.run_pipeline()
+    console.print(f"Analyzed {len(analysis_results)} files")
     
-    # Analyze actual content for intelligent categorization
-    console.print(f"\n[blue]Analyzing actual content of {len(all_files)} files...[/blue]")
-    console.print("[yellow]Note: Categories are unknown at start - AI will determine organization[/yellow]")
+    # No further AI requests: release the models while the user reviews the proposal
+    organizer.analyzer.unload_models()
     
-    analysis_results = organizer.analyze_all_content(all_files)
+    if not analysis_results:
+        console.print("[yellow]No files found to organize[/yellow]")
+        return
     
     # Display content analysis results
     console.print("\n[green]Content Analysis Complete![/green]")
@@ -388,12 +1578,13 @@ def main(directory, headless, interactive, dry_run, model):
     organization_proposal = organizer.generate_organization_proposal(analysis_results)
     
     # Display the proposed organization
-    organizer.display_organization_proposal(organization_proposal)
+    total_files = sum(map(len, organization_proposal.values()))
+    organizer.display_organization_proposal(organization_proposal, total_files)
     
     # Interactive mode - user approval of sorting policy
     proceed = True
     if mode:  # Interactive mode
-        proceed = organizer.request_sorting_policy_approval(organization_proposal)
+        proceed = organizer.request_sorting_policy_approval(organization_proposal, dry_run=dry_run)
         if not proceed:
             console.print("[yellow]Organization cancelled by user[/yellow]")
             return
@@ -409,7 +1600,7 @@ def main(directory, headless, interactive, dry_run, model):
         console.print("\n[bold green]Organization Complete![/bold green]")
         console.print(f"Files organized by content in: {Path(directory) / 'organized_by_content'}")
         console.print(f"Categories created: {len(organization_proposal)}")
-        console.print(f"Files organized: {sum(len(files) for files in organization_proposal.values())}")
+        console.print(f"Files organized: {total_files}")
     else:
         console.print("\n[yellow]Dry run complete - no files were moved[/yellow]")
         console.print("Remove --dry-run flag to execute the organization")
@@ -38,8 +38,9 @@ OLLAMA_PID=$!
 sleep 5
 
 # Pull the default model
-echo "Pulling default AI model (llama3.2:1b)..."
-ollama pull llama3.2:1b
+echo "Pulling default AI models (llama3.2:1b-instruct-q4_K_M, llama3.2:3b-instruct-q4_K_M)..."
+ollama pull llama3.2:1b-instruct-q4_K_M
+ollama pull llama3.2:3b-instruct-q4_K_M
 
 echo "Setup complete!"
 echo ""